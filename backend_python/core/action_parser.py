@@ -0,0 +1,52 @@
+"""
+Action Parser - Reads the ACTION:/INPUT: tool format that sub-agents answer with.
+Works incrementally over a token stream, so a tool can be dispatched as soon as
+its INPUT line is complete instead of after the whole response has arrived.
+"""
+
+
+class ActionStreamParser:
+    """
+    Feed it chunks; `action` becomes (tool_name, tool_input) once both lines are complete.
+    Same rules as the original parsing: the first line containing 'ACTION:' and the
+    first line containing 'INPUT:' win, and both must be non-empty.
+    """
+    def __init__(self):
+        self.text = ""
+        self.tool_name = None
+        self.tool_input = None
+        self._partial = ""
+
+    @property
+    def action(self):
+        if self.tool_name and self.tool_input:
+            return self.tool_name, self.tool_input
+        return None
+
+    def feed(self, chunk: str):
+        """Adds a chunk and returns the action if one is now complete."""
+        self.text += chunk
+        *complete, self._partial = (self._partial + chunk).split("\n")
+        for line in complete:
+            self._scan(line)
+        return self.action
+
+    def finish(self):
+        """Flushes the last, unterminated line at the end of the stream."""
+        if self._partial:
+            self._scan(self._partial)
+            self._partial = ""
+        return self.action
+
+    def _scan(self, line: str):
+        if self.tool_name is None and "ACTION:" in line:
+            self.tool_name = line.split("ACTION:")[1].strip()
+        if self.tool_input is None and "INPUT:" in line:
+            self.tool_input = line.split("INPUT:")[1].strip()
+
+
+def parse_action(response: str):
+    """Parses a complete response. Returns (tool_name, tool_input) or None."""
+    parser = ActionStreamParser()
+    parser.feed(response)
+    return parser.finish()
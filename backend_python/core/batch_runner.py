@@ -0,0 +1,280 @@
+"""
+Batch Runner - Offline bulk processing of agent tasks.
+Streams a JSONL task list through MotherBrain.process_task with bounded
+concurrency, appends each result as soon as it finishes and resumes from the
+results file after a crash.
+
+Usage:
+    python -m core.batch_runner tasks.jsonl results.jsonl [--concurrency 4] [--provider-batch]
+
+Each line in tasks.jsonl:
+    {"agent_name": "Hunter", "message": "Qualify: Acme AB, Stockholm", "id": "lead-17"}   # 'id' is optional
+
+With --provider-batch, the first think of every sub-agent task is submitted as
+one OpenAI Batch API job (cheaper, fits overnight runs). Responses that ask for
+a tool continue through the normal tool + synthesis path; Mother tasks and
+anything the batch could not answer run live.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+
+# Same model DualBrain._ask_openai uses for sub-agents
+BATCH_MODEL = "gpt-4o"
+BATCH_POLL_SECONDS = 60
+BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+# DualBrain reports provider failures as reply text instead of raising
+PROVIDER_ERROR_PREFIXES = ("Gemini Error:",)
+
+
+def load_tasks(path: str) -> list:
+    """Reads the task list, giving every task a stable id for checkpointing."""
+    tasks = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            task = json.loads(line)
+            task.setdefault("agent_name", "Mother")
+            task["id"] = str(task.get("id") or f"line-{line_no}")
+            if task["id"] in seen:
+                # Ids key the results file and the provider batch; duplicates would mix answers
+                raise ValueError(f"Duplicate task id '{task['id']}' on line {line_no} of {path}")
+            seen.add(task["id"])
+            tasks.append(task)
+    return tasks
+
+
+def completed_ids(output_path: str) -> set:
+    """The results file doubles as the checkpoint: every id with an 'ok' record is done."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                # Failed tasks stay pending so a resumed run retries them
+                if record.get("status", "ok") == "ok":
+                    done.add(record["id"])
+            except (json.JSONDecodeError, KeyError):
+                # A partially written last line from a crash; that task reruns
+                continue
+    return done
+
+
+class ResultWriter:
+    """
+    Appends one JSON line per finished task and reports throughput.
+    """
+    def __init__(self, output_path: str, total: int, already_done: int, progress_every: int = 10):
+        self._file = open(output_path, "a", encoding="utf-8")
+        # Terminate a line cut off by a crash so the next record starts clean
+        if self._file.tell() > 0:
+            with open(output_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+        self.total = total
+        self.done = already_done
+        self.written = 0
+        self.errors = 0
+        self.progress_every = progress_every
+        self.started = time.perf_counter()
+
+    def write(self, task: dict, response: str, seconds: float, status: str = "ok", source: str = "live"):
+        record = {
+            "id": task["id"],
+            "agent_name": task["agent_name"],
+            "message": task["message"],
+            "response": response,
+            "status": status,
+            "source": source,
+            "seconds": round(seconds, 3),
+        }
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+        self.done += 1
+        self.written += 1
+        if status != "ok":
+            self.errors += 1
+        if self.written % self.progress_every == 0 or self.done == self.total:
+            print(f"[BatchRunner] {self.done}/{self.total} done | {self.throughput():.1f} tasks/min | {self.errors} errors")
+
+    def throughput(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.written / elapsed * 60 if elapsed > 0 else 0.0
+
+    def close(self):
+        self._file.close()
+
+
+class BatchRunner:
+    """
+    Runs a task list through MotherBrain, live and (optionally) via the OpenAI Batch API.
+    """
+    def __init__(self, mother, concurrency: int = 4, verbose: bool = False):
+        self.mother = mother
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.verbose = verbose
+
+    async def _log(self, msg: str):
+        if self.verbose:
+            print(f"[LOG] {msg}")
+
+    async def run(self, input_path: str, output_path: str, provider_batch: bool = False, progress_every: int = 10) -> dict:
+        tasks = load_tasks(input_path)
+        done = completed_ids(output_path)
+        pending = [t for t in tasks if t["id"] not in done]
+        print(f"[BatchRunner] {len(tasks)} tasks, {len(done)} already done, {len(pending)} to run")
+
+        writer = ResultWriter(output_path, len(tasks), len(tasks) - len(pending), progress_every)
+        try:
+            client = self.mother.council.brain.openai_client
+            if provider_batch and client:
+                batched = [t for t in pending if t["agent_name"] != "Mother"]
+                live = [t for t in pending if t["agent_name"] == "Mother"]
+                await asyncio.gather(
+                    self._run_live(live, writer),
+                    self._run_provider_batch(batched, writer, output_path + ".checkpoint.json", input_path),
+                )
+            else:
+                if provider_batch:
+                    print("[BatchRunner] No OpenAI client, running everything live.")
+                await self._run_live(pending, writer)
+        finally:
+            writer.close()
+
+        return {
+            "total": len(tasks),
+            "written": writer.written,
+            "errors": writer.errors,
+            "tasks_per_minute": round(writer.throughput(), 2),
+        }
+
+    def _status(self, response: str) -> str:
+        return "error" if (response or "").startswith(PROVIDER_ERROR_PREFIXES) else "ok"
+
+    async def _run_live(self, tasks: list, writer: ResultWriter):
+        await asyncio.gather(*(self._run_one(task, writer) for task in tasks))
+
+    async def _run_one(self, task: dict, writer: ResultWriter):
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                response = await self.mother.process_task(task["message"], task["agent_name"], self._log, raise_errors=True)
+                writer.write(task, response, time.perf_counter() - start, status=self._status(response))
+            except Exception as e:
+                writer.write(task, f"[ERROR] {e}", time.perf_counter() - start, status="error")
+
+    # --- Provider batch ---
+
+    async def _run_provider_batch(self, tasks: list, writer: ResultWriter, checkpoint_path: str, input_path: str):
+        if not tasks:
+            return
+        client = self.mother.council.brain.openai_client
+
+        # Resume a job submitted before a crash instead of paying for it twice
+        input_path = os.path.abspath(input_path)
+        task_ids = [t["id"] for t in tasks]
+        batch_id = None
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            # Only a job submitted for these exact tasks can be reused; ids like line-N repeat across files
+            if checkpoint.get("input_path") == input_path and set(task_ids) <= set(checkpoint.get("task_ids", [])):
+                batch_id = checkpoint.get("openai_batch_id")
+                print(f"[BatchRunner] Resuming provider batch {batch_id}")
+            else:
+                print(f"[BatchRunner] Ignoring {checkpoint_path}: it belongs to a different task list")
+        if not batch_id:
+            batch_id = await asyncio.to_thread(self._submit_batch, client, tasks)
+            with open(checkpoint_path, "w", encoding="utf-8") as f:
+                json.dump({"openai_batch_id": batch_id, "input_path": input_path, "task_ids": task_ids}, f)
+            print(f"[BatchRunner] Submitted {len(tasks)} prompts as provider batch {batch_id}")
+
+        started = time.perf_counter()
+        batch = await asyncio.to_thread(client.batches.retrieve, batch_id)
+        while batch.status not in BATCH_TERMINAL_STATES:
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            batch = await asyncio.to_thread(client.batches.retrieve, batch_id)
+        print(f"[BatchRunner] Provider batch {batch_id} finished: {batch.status}")
+
+        answers = {}
+        if batch.output_file_id:
+            content = await asyncio.to_thread(client.files.content, batch.output_file_id)
+            for line in content.text.splitlines():
+                item = json.loads(line)
+                body = (item.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or []
+                if choices:
+                    answers[item["custom_id"]] = choices[0]["message"]["content"]
+
+        # Per-task share of the batch wall time, for the results file
+        share = (time.perf_counter() - started) / max(len(tasks), 1)
+        leftovers = [task for task in tasks if task["id"] not in answers]
+        await asyncio.gather(*(
+            self._finish_batched(task, answers[task["id"]], share, writer)
+            for task in tasks if task["id"] in answers
+        ))
+
+        if leftovers:
+            print(f"[BatchRunner] {len(leftovers)} prompts missing from the provider batch, running live")
+            await self._run_live(leftovers, writer)
+        os.remove(checkpoint_path)
+
+    async def _finish_batched(self, task: dict, response: str, seconds: float, writer: ResultWriter):
+        """Runs any tool the batched response asked for, then writes the final answer."""
+        async with self.semaphore:
+            try:
+                resolved = await self.mother.resolve_action(task["agent_name"], task["message"], response, self._log)
+                writer.write(task, resolved, seconds, status=self._status(resolved), source="provider_batch")
+            except Exception as e:
+                writer.write(task, f"[ERROR] {e}", seconds, status="error", source="provider_batch")
+
+    def _submit_batch(self, client, tasks: list) -> str:
+        lines = []
+        for task in tasks:
+            lines.append(json.dumps({
+                "custom_id": task["id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": BATCH_MODEL,
+                    "messages": [
+                        {"role": "system", "content": f"You are {task['agent_name']}."},
+                        {"role": "user", "content": self.mother.build_agent_prompt(task["agent_name"], task["message"])}
+                    ]
+                }
+            }, ensure_ascii=False))
+        payload = io.BytesIO("\n".join(lines).encode("utf-8"))
+        payload.name = "batch_tasks.jsonl"
+        input_file = client.files.create(file=payload, purpose="batch")
+        batch = client.batches.create(input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+        return batch.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a JSONL task list through Mother Brain")
+    parser.add_argument("tasks", help="JSONL file with {'agent_name', 'message', 'id'} per line")
+    parser.add_argument("output", help="JSONL results file (appended to; also the resume checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max tasks in flight")
+    parser.add_argument("--provider-batch", action="store_true", help="Submit sub-agent prompts via the OpenAI Batch API")
+    parser.add_argument("--progress-every", type=int, default=10, help="Print throughput every N tasks")
+    parser.add_argument("--verbose", action="store_true", help="Print agent logs")
+    args = parser.parse_args()
+
+    from mother_brain import MotherBrain
+    runner = BatchRunner(MotherBrain(), args.concurrency, args.verbose)
+    summary = asyncio.run(runner.run(args.tasks, args.output, args.provider_batch, args.progress_every))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
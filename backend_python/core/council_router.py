@@ -0,0 +1,192 @@
+"""
+Council Router - Cheap triage stage in front of the High Council.
+Decides how much thinking a request deserves before any expensive call is made:
+- simple  -> a single direct think call
+- medium  -> reduced council (Architect + Synthesizer)
+- complex -> the full High Council process
+"""
+
+import asyncio
+import os
+import re
+import time
+
+from core import traffic_capture
+
+SIMPLE = "simple"
+MEDIUM = "medium"
+COMPLEX = "complex"
+DEPTHS = (SIMPLE, MEDIUM, COMPLEX)
+
+GREETINGS = {
+    "hi", "hello", "hey", "hej", "hallå", "tjena", "yo", "thanks", "thank you",
+    "tack", "ok", "okay", "good morning", "god morgon", "bye",
+}
+
+# Words that usually mean the user wants planning, multiple steps or analysis.
+# Matched at the start of a word so inflections and compounds count too
+# ('planning', 'analysis', 'kampanjplan', 'strategin'); listed as stems, so no
+# marker may be a prefix of another or the request would be scored twice.
+COMPLEX_MARKERS = [
+    r"strateg", r"plan(?!et|es?\b)", r"analy", r"compar", r"research", r"campaign",
+    r"kampanj", r"roadmap", r"step by step", r"swot", r"architect", r"evaluat",
+    r"pros and cons", r"forecast", r"and then", r"multiple", r"breakdown", r"in detail",
+]
+MARKER_PATTERNS = [re.compile(rf"\b{marker}") for marker in COMPLEX_MARKERS]
+
+CLASSIFIER_PROMPT = """Classify how much reasoning this request needs.
+Answer with exactly one word:
+- simple: greetings, small talk, single facts, one-line answers
+- medium: a short piece of writing or advice with a few considerations
+- complex: multi-step planning, research, strategy or analysis
+
+REQUEST: {request}"""
+
+
+class RoutingMetrics:
+    """
+    Counts how requests are routed and how long each depth takes end to end.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.routed = {depth: 0 for depth in DEPTHS}
+        self.latency_total = {depth: 0.0 for depth in DEPTHS}
+        self.completed = {depth: 0 for depth in DEPTHS}
+        self.heuristic_decisions = 0
+        self.classifier_decisions = 0
+        self.classifier_errors = 0
+        self.triage_time_total = 0.0
+
+    def record_route(self, depth: str, source: str, triage_seconds: float):
+        self.routed[depth] += 1
+        self.triage_time_total += triage_seconds
+        if source == "classifier":
+            self.classifier_decisions += 1
+        else:
+            self.heuristic_decisions += 1
+
+    def record_latency(self, depth: str, seconds: float):
+        self.completed[depth] += 1
+        self.latency_total[depth] += seconds
+
+    def snapshot(self) -> dict:
+        """Returns a JSON-friendly view of the counters"""
+        total = sum(self.routed.values())
+        return {
+            "total_requests": total,
+            "routed": dict(self.routed),
+            "avg_latency_seconds": {
+                depth: round(self.latency_total[depth] / self.completed[depth], 3) if self.completed[depth] else None
+                for depth in DEPTHS
+            },
+            "heuristic_decisions": self.heuristic_decisions,
+            "classifier_decisions": self.classifier_decisions,
+            "classifier_errors": self.classifier_errors,
+            "avg_triage_ms": round(self.triage_time_total / total * 1000, 2) if total else None,
+        }
+
+
+class CouncilRouter:
+    """
+    Triage for Mother requests: heuristics first, optional small-model classifier
+    for the cases the heuristics cannot decide.
+
+    Environment:
+        COUNCIL_ROUTING: 'off' sends everything to the full council (default 'on')
+        COUNCIL_CLASSIFIER_MODEL: OpenAI model used for ambiguous requests (e.g. gpt-4o-mini).
+                                  Without it, ambiguous requests go to the reduced council.
+    """
+    def __init__(self, brain=None, classifier_model: str = None):
+        self.brain = brain
+        self.enabled = os.getenv("COUNCIL_ROUTING", "on").lower() not in ("0", "off", "false", "no")
+        self.classifier_model = classifier_model or os.getenv("COUNCIL_CLASSIFIER_MODEL")
+        self.metrics = RoutingMetrics()
+
+    def heuristic_depth(self, user_request: str):
+        """
+        Scores the request without any model call.
+
+        Returns:
+            (depth, confident) - confident is False when the classifier should decide
+        """
+        text = user_request.strip().lower()
+        words = re.findall(r"\w+", text)
+        normalized = " ".join(words)
+
+        if not words or normalized in GREETINGS:
+            return SIMPLE, True
+
+        markers = sum(1 for pattern in MARKER_PATTERNS if pattern.search(text))
+        questions = text.count("?")
+        lines = len([l for l in user_request.splitlines() if l.strip()])
+
+        if markers >= 2 or len(words) > 80 or lines > 4:
+            return COMPLEX, True
+        if len(words) <= 8 and markers == 0 and questions <= 1:
+            return SIMPLE, True
+        if markers == 1 or questions > 1 or len(words) > 40:
+            return MEDIUM, False
+        return SIMPLE, False
+
+    async def triage(self, user_request: str) -> str:
+        """
+        Picks the council depth for a request and records the decision.
+        """
+        start = time.perf_counter()
+        if not self.enabled:
+            self.metrics.record_route(COMPLEX, "heuristic", time.perf_counter() - start)
+            return COMPLEX
+
+        # Offline replay: reuse the production decision so the recorded think calls still match
+        recorded = None
+        if traffic_capture.traffic.replaying:
+            recorded = await traffic_capture.traffic.replay_triage(user_request)
+
+        if recorded:
+            depth, source = recorded
+        else:
+            depth, source = await self._decide(user_request)
+
+        elapsed = time.perf_counter() - start
+        if traffic_capture.traffic.recording:
+            traffic_capture.traffic.record_triage(user_request, depth, source, elapsed)
+        self.metrics.record_route(depth, source, elapsed)
+        return depth
+
+    async def _decide(self, user_request: str):
+        depth, confident = self.heuristic_depth(user_request)
+        source = "heuristic"
+
+        # Never reach the network during replay, even if a key happens to be set
+        if not confident and not traffic_capture.traffic.replaying:
+            classified = await self._classify(user_request)
+            if classified:
+                depth, source = classified, "classifier"
+        if source == "heuristic" and not confident and depth == SIMPLE:
+            # Without a second opinion, err on the side of more thinking
+            depth = MEDIUM
+        return depth, source
+
+    async def _classify(self, user_request: str):
+        """Asks the small model for a depth label. Returns None if unavailable."""
+        client = getattr(self.brain, "openai_client", None)
+        if not self.classifier_model or not client:
+            return None
+
+        try:
+            # The OpenAI SDK is blocking; keep it off the event loop
+            response = await asyncio.to_thread(
+                client.chat.completions.create,
+                model=self.classifier_model,
+                messages=[{"role": "user", "content": CLASSIFIER_PROMPT.format(request=user_request[:2000])}],
+                max_tokens=3,
+                temperature=0
+            )
+            label = (response.choices[0].message.content or "").strip().lower()
+            return next((depth for depth in DEPTHS if depth in label), None)
+        except Exception as e:
+            print(f"[CouncilRouter] Classifier failed, using heuristics: {e}")
+            self.metrics.classifier_errors += 1
+            return None
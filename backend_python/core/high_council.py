@@ -1,8 +1,13 @@
 
 import os
+import time
+import asyncio
+import threading
 import google.generativeai as genai
 from openai import OpenAI
 from dotenv import load_dotenv
+from core.council_router import CouncilRouter, SIMPLE, MEDIUM
+from core import traffic_capture
 
 load_dotenv("python_secrets.env")
 
@@ -55,14 +60,120 @@ class DualBrain:
         # - Architect/Synthesizer -> Gemini 1.5 Pro (Large Context)
         # - Researcher/Critic -> GPT-4o (Precision)
         
+        # Offline replay: serve the recorded response instead of calling a provider
+        if traffic_capture.traffic.replaying:
+            return await traffic_capture.traffic.replay_think(role, preferred_model, prompt)
+
+        start = time.perf_counter()
+
         # For Prototype: simple routing
-        params = {"role": role, "prompt": prompt}
-        
+        # Both SDKs block, so call them from a worker thread to let other requests run meanwhile
         if preferred_model == "openai" and self.openai_client:
-            return self._ask_openai(role, prompt)
-        
-        # Default to Gemini
-        return self._ask_gemini(role, prompt)
+            response = await asyncio.to_thread(self._ask_openai, role, prompt)
+        else:
+            # Default to Gemini
+            response = await asyncio.to_thread(self._ask_gemini, role, prompt)
+
+        if traffic_capture.traffic.recording:
+            traffic_capture.traffic.record_think(role, preferred_model, prompt, response, time.perf_counter() - start)
+        return response
+
+    async def think_stream(self, prompt: str, role: str = "Assistant", preferred_model: str = "auto"):
+        """
+        Same routing as think(), but yields the response in chunks as the provider
+        produces them. Closing the generator early cancels an OpenAI generation;
+        for Gemini the rest of the stream is only ignored (the SDK has no cancel).
+        An OpenAI stream that breaks after its first chunk raises instead of
+        ending early, so a truncated reply is never taken for a complete one.
+        """
+        # Offline replay: the recording is served as a single chunk
+        if traffic_capture.traffic.replaying:
+            yield await traffic_capture.traffic.replay_think(role, preferred_model, prompt)
+            return
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            # Provider SDKs stream with blocking iterators, so read them off the event loop
+            if preferred_model == "openai" and self.openai_client:
+                chunks = self._stream_openai(role, prompt)
+            else:
+                chunks = self._stream_gemini(role, prompt)
+            try:
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                # Hand the failure to the consumer so it is raised there, not swallowed here
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                chunks.close()
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        start = time.perf_counter()
+        parts = []
+        failed = False
+        loop.run_in_executor(None, produce)
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is done:
+                    break
+                if isinstance(chunk, Exception):
+                    failed = True
+                    raise chunk
+                parts.append(chunk)
+                yield chunk
+        finally:
+            stop.set()
+            if traffic_capture.traffic.recording and not failed:
+                # A cancelled stream records what was actually generated
+                traffic_capture.traffic.record_think(role, preferred_model, prompt, "".join(parts), time.perf_counter() - start)
+
+    def _stream_gemini(self, role, prompt):
+        # google-generativeai exposes no way to cancel a streaming response, so once the
+        # consumer stops we just stop reading; the remaining chunks are discarded
+        try:
+            full_prompt = f"ROLE: {role}\n\nTASK: {prompt}"
+            for chunk in self.gemini_model.generate_content(full_prompt, stream=True):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            yield f"Gemini Error: {e}"
+
+    def _stream_openai(self, role, prompt):
+        stream = None
+        started = False
+        try:
+            stream = self.openai_client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": f"You are {role}."},
+                    {"role": "user", "content": prompt}
+                ],
+                stream=True
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    started = True
+                    yield delta
+        except Exception as e:
+            # Only fall back if nothing was streamed yet, otherwise the answers would mix
+            if started:
+                print(f"OpenAI stream interrupted: {e}")
+                raise
+            else:
+                print(f"OpenAI Failed, falling back to Gemini: {e}")
+                yield from self._stream_gemini(role, prompt)
+        finally:
+            if stream is not None:
+                # Closing the HTTP response is what actually cancels the generation
+                stream.close()
 
     def _ask_gemini(self, role, prompt):
         try:
@@ -93,6 +204,51 @@ class HighCouncil:
     """
     def __init__(self):
         self.brain = DualBrain()
+        self.router = CouncilRouter(self.brain)
+
+    async def route_council(self, user_request: str, log_callback=None):
+        """
+        Triages the request and runs only as much of the council as it needs.
+        """
+        async def log(msg):
+            if log_callback: await log_callback(msg)
+
+        start = time.perf_counter()
+        depth = await self.router.triage(user_request)
+        await log(f"[High_Council] -> 🚦 Triage: {depth} request")
+
+        if depth == SIMPLE:
+            response = await self.execute_fast(user_request, log_callback)
+        elif depth == MEDIUM:
+            response = await self.execute_reduced(user_request, log_callback)
+        else:
+            response = await self.execute_council(user_request, log_callback)
+
+        self.router.metrics.record_latency(depth, time.perf_counter() - start)
+        return response
+
+    async def execute_fast(self, user_request: str, log_callback=None):
+        """
+        Fast path for trivial requests: one direct think call, no council.
+        """
+        if log_callback: await log_callback("[High_Council] -> ⚡ Answering directly...")
+        return await self.brain.think(user_request, role="Mother", preferred_model="gemini")
+
+    async def execute_reduced(self, user_request: str, log_callback=None):
+        """
+        Reduced council: The Architect plans and The Synthesizer answers.
+        Skips the Researcher and Critic rounds.
+        """
+        async def log(msg):
+            if log_callback: await log_callback(msg)
+
+        await log("[High_Council] -> 🏛️ The Architect is planning...")
+        plan_prompt = f"Analyze this request: '{user_request}'. Break it down into 3 clear steps for the Hive Mind."
+        plan = await self.brain.think(plan_prompt, role="The Architect", preferred_model="gemini")
+
+        await log("[High_Council] -> 🔗 The Synthesizer is merging results...")
+        synth_prompt = f"Synthesize everything into a final instruction for the Agents:\nRequest: {user_request}\nPlan: {plan}"
+        return await self.brain.think(synth_prompt, role="The Synthesizer", preferred_model="gemini")
 
     async def execute_council(self, user_request: str, log_callback=None):
         """
@@ -0,0 +1,113 @@
+"""
+Loop Monitor - Detects callbacks that block the asyncio event loop.
+A heartbeat coroutine ticks the loop every few milliseconds; a watchdog thread
+notices when the heartbeat stops and captures the loop thread's stack while it
+is still blocked, so the offending sync call (SDK request, Gmail .execute(), ...)
+shows up by name.
+
+Environment:
+    LOOP_MONITOR: 'off' disables monitoring (default 'on')
+    LOOP_STALL_THRESHOLD_MS: report callbacks blocking longer than this (default 200)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class LoopMonitor:
+    """
+    Event-loop lag monitor with stack capture for stalls.
+    """
+    def __init__(self, threshold_ms: float = 200, interval_ms: float = 50, history: int = 50):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.enabled = True
+        self.stalls = deque(maxlen=history)
+        self.max_lag_ms = 0.0
+        self.ticks = 0
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+        self._current = None
+        self._running = False
+        self._task = None
+        self._thread = None
+        self._loop_thread_id = None
+
+    @classmethod
+    def from_env(cls):
+        monitor = cls(threshold_ms=float(os.getenv("LOOP_STALL_THRESHOLD_MS", "200")))
+        monitor.enabled = os.getenv("LOOP_MONITOR", "on").lower() not in ("0", "off", "false", "no")
+        return monitor
+
+    def start(self):
+        """Starts monitoring the running loop. Call from inside the loop (e.g. on startup)."""
+        if not self.enabled or self._running:
+            return
+        self._running = True
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+        print(f"[LoopMonitor] Watching event loop (stall threshold {self.threshold * 1000:.0f} ms)")
+
+    def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+
+    async def _beat(self):
+        while self._running:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag_ms = max(0.0, (now - expected) * 1000)
+            self.ticks += 1
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+            with self._lock:
+                self._heartbeat = now
+                stall, self._current = self._current, None
+            if stall:
+                # The watchdog captured the stack; now we know how long it lasted
+                stall["blocked_ms"] = round(lag_ms, 1)
+                # The innermost frames name the blocking call; the loop internals above add nothing
+                print(f"[LoopMonitor] ⚠️ Event loop blocked for {stall['blocked_ms']:.0f} ms in:\n{''.join(stall['stack'][-8:])}")
+
+    def _watch(self):
+        while self._running:
+            time.sleep(self.interval)
+            with self._lock:
+                blocked = time.monotonic() - self._heartbeat
+                if blocked < self.threshold or self._current:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stall = {
+                    "detected_at": round(time.time(), 3),
+                    "blocked_ms": round(blocked * 1000, 1),
+                    "stack": traceback.format_stack(frame) if frame else [],
+                }
+                self._current = stall
+                self.stalls.append(stall)
+
+    def snapshot(self) -> dict:
+        """Returns recent stalls and lag counters"""
+        with self._lock:
+            stalls = list(self.stalls)
+        return {
+            "enabled": self.enabled and self._running,
+            "threshold_ms": self.threshold * 1000,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "ticks": self.ticks,
+            "stall_count": len(stalls),
+            "stalls": stalls,
+        }
+
+
+# Singleton instance to be used across the app
+loop_monitor = LoopMonitor.from_env()
@@ -0,0 +1,144 @@
+"""
+Routing Evaluation - Offline harness for the Council Router.
+Measures how much latency the fast/reduced paths save against the full council,
+and how far their answers drift from the full council's answer.
+
+Usage:
+    python -m core.routing_eval cases.jsonl [--triage-only] [--out report.json]
+
+Each line in cases.jsonl:
+    {"message": "hi", "expected": "simple"}    # 'expected' is optional
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import os
+import time
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+from core.council_router import CouncilRouter, MEDIUM, COMPLEX, DEPTHS
+
+load_dotenv("python_secrets.env")
+
+
+def triage_router() -> CouncilRouter:
+    """
+    Router for --triage-only runs: same classifier as production when one is
+    configured, without starting the full DualBrain.
+    """
+    brain = None
+    if os.getenv("COUNCIL_CLASSIFIER_MODEL") and os.getenv("OPENAI_API_KEY"):
+        from openai import OpenAI
+        brain = SimpleNamespace(openai_client=OpenAI(api_key=os.getenv("OPENAI_API_KEY")))
+    return CouncilRouter(brain)
+
+
+def load_cases(path: str) -> list:
+    cases = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                cases.append(json.loads(line))
+    return cases
+
+
+def answer_overlap(a: str, b: str) -> float:
+    """Cheap quality proxy: word-set Jaccard similarity between two answers."""
+    wa, wb = set(re.findall(r"\w+", a.lower())), set(re.findall(r"\w+", b.lower()))
+    if not wa and not wb:
+        return 1.0
+    return len(wa & wb) / len(wa | wb)
+
+
+async def evaluate(cases: list, triage_only: bool = False) -> dict:
+    """
+    Runs every case through triage and (unless triage_only) through both the
+    routed path and the full council.
+    """
+    council = None
+    if triage_only:
+        router = triage_router()
+    else:
+        from core.high_council import HighCouncil
+        council = HighCouncil()
+        router = council.router
+
+    rows = []
+    for case in cases:
+        message = case["message"]
+        depth = await router.triage(message)
+        row = {"message": message, "depth": depth, "expected": case.get("expected")}
+
+        if council:
+            start = time.perf_counter()
+            if depth == COMPLEX:
+                routed = await council.execute_council(message)
+            elif depth == MEDIUM:
+                routed = await council.execute_reduced(message)
+            else:
+                routed = await council.execute_fast(message)
+            row["routed_seconds"] = time.perf_counter() - start
+
+            if depth == COMPLEX:
+                full, row["full_seconds"] = routed, row["routed_seconds"]
+            else:
+                start = time.perf_counter()
+                full = await council.execute_council(message)
+                row["full_seconds"] = time.perf_counter() - start
+            row["overlap_with_full"] = round(answer_overlap(routed, full), 3)
+
+        rows.append(row)
+        print(f"[RoutingEval] {depth:>7} | {message[:60]}")
+
+    scored = "heuristics + classifier" if router.classifier_model and getattr(router.brain, "openai_client", None) else "heuristics only"
+    return {"summary": summarize(rows, scored), "cases": rows}
+
+
+def summarize(rows: list, scored: str = "heuristics only") -> dict:
+    labelled = [r for r in rows if r.get("expected")]
+    summary = {
+        # Which router produced these numbers; without the classifier they do not match production
+        "router": scored,
+        "cases": len(rows),
+        "routed": {d: sum(1 for r in rows if r["depth"] == d) for d in DEPTHS},
+        "label_accuracy": round(sum(r["depth"] == r["expected"] for r in labelled) / len(labelled), 3) if labelled else None,
+        # Routing lighter than the label is the quality risk; heavier only costs latency
+        "under_routed": sum(1 for r in labelled if _rank(r["depth"]) < _rank(r["expected"])),
+    }
+
+    timed = [r for r in rows if "routed_seconds" in r]
+    if timed:
+        routed_total = sum(r["routed_seconds"] for r in timed)
+        full_total = sum(r["full_seconds"] for r in timed)
+        summary["routed_seconds_total"] = round(routed_total, 2)
+        summary["full_seconds_total"] = round(full_total, 2)
+        summary["latency_saved_pct"] = round((1 - routed_total / full_total) * 100, 1) if full_total else None
+        summary["avg_overlap_with_full"] = round(sum(r["overlap_with_full"] for r in timed) / len(timed), 3)
+    return summary
+
+
+def _rank(depth: str) -> int:
+    return DEPTHS.index(depth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline evaluation of council routing")
+    parser.add_argument("cases", help="JSONL file with {'message', 'expected'} per line")
+    parser.add_argument("--triage-only", action="store_true", help="Only score routing decisions, no council calls")
+    parser.add_argument("--out", help="Write the full report as JSON to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(evaluate(load_cases(args.cases), args.triage_only))
+    print(json.dumps(report["summary"], indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Sampling Profiler - Time-boxed, low-overhead profile of live traffic.
+A background thread snapshots every thread's stack at a fixed interval and
+aggregates the samples taken while a focus function (MotherBrain.process_task
+by default) is on the stack. Output includes collapsed stacks that can be fed
+straight into flamegraph tools.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_FOCUS = ("process_task", "_run_task")
+MAX_SECONDS = 60
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename.replace("\\", "/").rsplit("/", 1)[-1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _stack(frame) -> list:
+    """Root-to-leaf list of frames."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+class SamplingProfiler:
+    """
+    Only one profile can run at a time; a second request gets a RuntimeError.
+    """
+    def __init__(self, interval_ms: float = 5):
+        self.interval = interval_ms / 1000
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, seconds: float, focus=DEFAULT_FOCUS, top: int = 25) -> dict:
+        """
+        Samples for `seconds` (capped at MAX_SECONDS) and returns the aggregate.
+        Blocking - run it in a worker thread from async code.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            return self._sample(min(seconds, MAX_SECONDS), set(focus), top)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, focus: set, top: int) -> dict:
+        me = threading.get_ident()
+        ignored = {t.ident for t in threading.enumerate() if t.name == "loop-monitor"}
+        collapsed = Counter()
+        inclusive = Counter()
+        leaf = Counter()
+        samples = 0
+        focus_samples = 0
+
+        started = time.monotonic()
+        deadline = started + seconds
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me or thread_id in ignored:
+                    continue
+                samples += 1
+                frames = _stack(frame)
+                if focus and not any(f.f_code.co_name in focus for f in frames):
+                    continue
+                focus_samples += 1
+                labels = [_frame_label(f) for f in frames]
+                collapsed[";".join(labels)] += 1
+                leaf[labels[-1]] += 1
+                for label in set(labels):
+                    inclusive[label] += 1
+            time.sleep(self.interval)
+
+        def ranked(counter):
+            return [
+                {"function": name, "samples": count, "pct": round(count / focus_samples * 100, 1)}
+                for name, count in counter.most_common(top)
+            ]
+
+        return {
+            "seconds": round(time.monotonic() - started, 2),
+            "interval_ms": self.interval * 1000,
+            "focus": sorted(focus),
+            "samples_total": samples,
+            "samples_in_focus": focus_samples,
+            "top_inclusive": ranked(inclusive) if focus_samples else [],
+            "top_self": ranked(leaf) if focus_samples else [],
+            "collapsed": [f"{stack} {count}" for stack, count in collapsed.most_common(200)],
+        }
+
+
+# Singleton instance to be used across the app
+profiler = SamplingProfiler()
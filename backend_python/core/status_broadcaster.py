@@ -3,21 +3,66 @@ import json
 import asyncio
 from fastapi import WebSocket
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Opt-in binary protocol, requested as a WebSocket subprotocol at connect time
+COMPACT_PROTOCOL = "mother.compact.v1"
+
 class StatusBroadcaster:
     """
     Manages real-time status updates to the frontend dashboard.
+
+    Two wire formats:
+    - JSON (default): one text frame per event, as before.
+    - Compact (subprotocol 'mother.compact.v1'): msgpack binary frames. A snapshot of
+      every agent status on connect, then at most one frame per tick carrying only the
+      agent statuses that changed plus the logs since the last tick.
     """
-    def __init__(self):
+    def __init__(self, tick_seconds: float = 0.1):
         self.active_connections: list[WebSocket] = []
+        self.compact_connections: list[WebSocket] = []
+        self.tick_seconds = tick_seconds
+        # Last known status per agent, used for snapshots
+        self.agent_states: dict = {}
+        # What compact clients have already been told
+        self._sent_states: dict = {}
+        self._dirty: dict = {}
+        self._pending_logs: list = []
+        self._flush_task = None
 
     async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        print(f"[StatusBroadcaster] Client connected. Total: {len(self.active_connections)}")
+        requested = websocket.scope.get("subprotocols", [])
+        if COMPACT_PROTOCOL in requested and msgpack:
+            await websocket.accept(subprotocol=COMPACT_PROTOCOL)
+            if not self.compact_connections:
+                # First compact client: the snapshot below is the baseline for deltas
+                self._reset_compact_state()
+                self._sent_states = dict(self.agent_states)
+            self.compact_connections.append(websocket)
+            # Late joiners start from what the others were last told; changes still
+            # queued in _dirty reach everyone as deltas on the next tick
+            snapshot = {**self.agent_states, **self._sent_states}
+            await websocket.send_bytes(self._pack({"t": "snapshot", "s": snapshot}))
+        else:
+            await websocket.accept()
+            self.active_connections.append(websocket)
+        print(f"[StatusBroadcaster] Client connected. Total: {self._connection_count()}")
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        print(f"[StatusBroadcaster] Client disconnected. Total: {len(self.active_connections)}")
+        if websocket in self.compact_connections:
+            self.compact_connections.remove(websocket)
+            if not self.compact_connections:
+                # Nobody left to deliver queued deltas to
+                self._reset_compact_state()
+        else:
+            self.active_connections.remove(websocket)
+        print(f"[StatusBroadcaster] Client disconnected. Total: {self._connection_count()}")
+
+    def _connection_count(self) -> int:
+        return len(self.active_connections) + len(self.compact_connections)
 
     async def broadcast_log(self, message: str, level: str = "INFO"):
         """Sends a text log to the console."""
@@ -28,11 +73,16 @@ class StatusBroadcaster:
         }
         await self._send_all(payload)
 
+        if self.compact_connections:
+            self._pending_logs.append([message, level])
+            self._schedule_flush()
+
     async def broadcast_agent_status(self, agent_name: str, status: str):
         """
         Updates the visual state of an agent card.
         Status: 'IDLE', 'THINKING', 'WORKING', 'ERROR', 'SUCCESS'
         """
+        self.agent_states[agent_name] = status
         payload = {
             "type": "agent_status",
             "agent": agent_name,
@@ -40,6 +90,10 @@ class StatusBroadcaster:
         }
         await self._send_all(payload)
 
+        if self.compact_connections:
+            self._dirty[agent_name] = status
+            self._schedule_flush()
+
     async def _send_all(self, data: dict):
         for connection in self.active_connections:
             try:
@@ -48,5 +102,47 @@ class StatusBroadcaster:
                 print(f"Error broadcasting: {e}")
                 # We might want to remove dead connections here, but disconnect() handles it usually
 
+    # --- Compact protocol ---
+
+    def _reset_compact_state(self):
+        self._dirty = {}
+        self._pending_logs = []
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+
+    def _pack(self, data: dict) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_after_tick())
+
+    async def _flush_after_tick(self):
+        # Keep ticking while anything is queued, including updates that arrive during a send
+        while self._dirty or self._pending_logs:
+            await asyncio.sleep(self.tick_seconds)
+
+            # Only statuses that differ from what compact clients last saw
+            changes = {agent: status for agent, status in self._dirty.items() if self._sent_states.get(agent) != status}
+            logs, self._pending_logs = self._pending_logs, []
+            self._dirty = {}
+            if not changes and not logs:
+                continue
+            self._sent_states.update(changes)
+
+            frame = {"t": "tick"}
+            if changes:
+                frame["s"] = changes
+            if logs:
+                frame["l"] = logs
+            data = self._pack(frame)
+
+            for connection in list(self.compact_connections):
+                try:
+                    await connection.send_bytes(data)
+                except Exception as e:
+                    print(f"Error broadcasting: {e}")
+
 # Singleton instance to be used across the app
 broadcaster = StatusBroadcaster()
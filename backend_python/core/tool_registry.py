@@ -4,6 +4,9 @@ Tool Registry - Maps tool names to their implementations.
 Mother Brain uses this registry to execute agent requests.
 """
 
+import time
+
+from core import traffic_capture
 from tools.social_tool import LinkedInTool
 from tools.email_tool import GmailTool
 
@@ -38,16 +41,24 @@ def execute_tool(tool_name: str, *args, **kwargs):
     Returns:
         Result from the tool execution
     """
+    # Offline replay: serve the recorded output instead of touching external APIs
+    if traffic_capture.traffic.replaying:
+        return traffic_capture.traffic.replay_tool(tool_name, args, kwargs)
+
     tool_func = TOOL_FUNCTIONS.get(tool_name)
     
     if not tool_func:
         return f"[ERROR] Tool '{tool_name}' not found in registry. Available tools: {list(TOOL_FUNCTIONS.keys())}"
     
+    start = time.perf_counter()
     try:
         result = tool_func(*args, **kwargs)
-        return result
     except Exception as e:
-        return f"[ERROR] Tool '{tool_name}' failed: {str(e)}"
+        result = f"[ERROR] Tool '{tool_name}' failed: {str(e)}"
+
+    if traffic_capture.traffic.recording:
+        traffic_capture.traffic.record_tool(tool_name, args, kwargs, result, time.perf_counter() - start)
+    return result
 
 def list_available_tools():
     """Returns list of all available tool names"""
@@ -0,0 +1,326 @@
+"""
+Traffic Capture - Opt-in record/replay of provider and tool traffic.
+Records every DualBrain.think call, council triage decision, tool execution and
+incoming task into gzip-compressed JSONL. Each process writes its own segment
+next to the configured path (captures/prod.jsonl.gz -> captures/prod-<time>-<pid>.jsonl.gz),
+so a crashed process can only damage the tail of its own segment. The replay side serves those
+responses back with their original (or scaled) timing, so a production
+session can be re-run offline without network access or API keys.
+
+Environment:
+    TRAFFIC_CAPTURE: capture path to record into (e.g. captures/prod.jsonl.gz)
+    TRAFFIC_REPLAY: capture path to replay from, reads all its segments (takes precedence over TRAFFIC_CAPTURE)
+    TRAFFIC_REPLAY_TIME_SCALE: delay multiplier during replay (1 = original, 0 = instant)
+
+Usage:
+    python -m core.traffic_capture stats captures/prod.jsonl.gz
+    python -m core.traffic_capture replay captures/prod.jsonl.gz [--time-scale 0]
+"""
+
+import argparse
+import asyncio
+import glob
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from dotenv import load_dotenv
+
+# The singleton below reads TRAFFIC_* at import, before mother_brain loads the env file
+load_dotenv("python_secrets.env")
+
+
+def request_key(*parts) -> str:
+    """Stable short hash used to match a replayed call to its recording."""
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _split_capture_path(path: str):
+    for ext in (".jsonl.gz", ".gz"):
+        if path.endswith(ext):
+            return path[:-len(ext)], ext
+    return path, ".jsonl.gz"
+
+
+def segment_path(path: str) -> str:
+    """Per-process segment file for a capture path."""
+    root, ext = _split_capture_path(path)
+    return f"{root}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}{ext}"
+
+
+def capture_segments(path: str) -> list:
+    """All segments of a capture, oldest first (plus `path` itself if it exists)."""
+    root, ext = _split_capture_path(path)
+    segments = sorted(glob.glob(f"{glob.escape(root)}-*{ext}"))
+    if os.path.exists(path):
+        segments.insert(0, path)
+    return segments
+
+
+def read_capture(path: str):
+    """
+    Yields records from every segment of a capture. A segment whose process
+    died mid-write is read up to the damage; the other segments are unaffected.
+    """
+    for segment in capture_segments(path):
+        with gzip.open(segment, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            except (EOFError, zlib.error, gzip.BadGzipFile, json.JSONDecodeError) as e:
+                # The process died mid-write; everything before this point is intact
+                print(f"[TrafficCapture] {segment} is truncated ({e}), keeping the records before it")
+
+
+class TrafficCapture:
+    """
+    Recorder and replayer in one object. Mode is 'off', 'record' or 'replay'.
+    """
+    def __init__(self, mode: str = "off", path: str = None, time_scale: float = 1.0):
+        self.mode = mode
+        self.path = path
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self._file = None
+        self._by_key = defaultdict(deque)
+        self._by_kind = defaultdict(deque)
+        self._served = set()
+        self.replay_misses = 0
+
+        if mode == "record":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # One segment per process: a crash never corrupts another run's records
+            segment = segment_path(path)
+            self._file = gzip.open(segment, "wt", encoding="utf-8")
+            print(f"[TrafficCapture] Recording traffic to {segment}")
+        elif mode == "replay":
+            self._load(path)
+
+    @classmethod
+    def from_env(cls):
+        replay_path = os.getenv("TRAFFIC_REPLAY")
+        if replay_path:
+            return cls("replay", replay_path, float(os.getenv("TRAFFIC_REPLAY_TIME_SCALE", "1")))
+        capture_path = os.getenv("TRAFFIC_CAPTURE")
+        if capture_path:
+            return cls("record", capture_path)
+        return cls()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    # --- Recording ---
+
+    def record_think(self, role: str, model: str, prompt: str, response: str, seconds: float):
+        self._write({
+            "kind": "think",
+            "key": request_key(role, model, prompt),
+            "role": role,
+            "model": model,
+            "prompt": prompt,
+            "response": response,
+            "prompt_chars": len(prompt),
+            "response_chars": len(response or ""),
+            "seconds": round(seconds, 4),
+        })
+
+    def record_tool(self, tool_name: str, args, kwargs, result, seconds: float):
+        result_text = result if isinstance(result, str) else json.dumps(result, default=str)
+        self._write({
+            "kind": "tool",
+            "key": request_key(tool_name, list(args), kwargs),
+            "tool": tool_name,
+            "args": list(args),
+            "kwargs": kwargs,
+            "result": result_text,
+            "result_chars": len(result_text),
+            "seconds": round(seconds, 4),
+        })
+
+    def record_triage(self, user_request: str, depth: str, source: str, seconds: float):
+        self._write({
+            "kind": "triage",
+            "key": request_key(user_request),
+            "depth": depth,
+            "source": source,
+            "seconds": round(seconds, 4),
+        })
+
+    def record_task(self, agent_name: str, user_input: str, started_at: float, seconds: float):
+        self._write({
+            "kind": "task",
+            "agent": agent_name,
+            "message": user_input,
+            "started_at": round(started_at, 3),
+            "seconds": round(seconds, 4),
+        })
+
+    def _write(self, record: dict):
+        record["ts"] = round(time.time(), 3)
+        line = json.dumps(record, ensure_ascii=False, default=str, separators=(",", ":"))
+        with self._lock:
+            try:
+                self._file.write(line + "\n")
+                # Sync-flush so a crash loses at most the record being written
+                self._file.flush()
+            except Exception as e:
+                print(f"[TrafficCapture] Failed to write record: {e}")
+
+    def close(self):
+        if self._file:
+            with self._lock:
+                self._file.close()
+                self._file = None
+
+    # --- Replay ---
+
+    def _load(self, path: str):
+        count = 0
+        for index, record in enumerate(read_capture(path)):
+            record["_index"] = index
+            if record.get("key"):
+                self._by_key[(record["kind"], record["key"])].append(record)
+            self._by_kind[record["kind"]].append(record)
+            count += 1
+        print(f"[TrafficCapture] Replaying {count} recorded events from {path}")
+
+    def recorded_tasks(self) -> list:
+        return list(self._by_kind["task"])
+
+    def _next_record(self, kind: str, key: str, fallback: bool = True):
+        """
+        Exact match on the request key first; otherwise (if fallback) the next
+        unserved record of the same kind in recording order.
+        """
+        with self._lock:
+            exact = self._by_key.get((kind, key))
+            while exact:
+                record = exact.popleft()
+                if record["_index"] not in self._served:
+                    self._served.add(record["_index"])
+                    return record
+
+            in_order = self._by_kind.get(kind) if fallback else None
+            while in_order:
+                record = in_order.popleft()
+                if record["_index"] not in self._served:
+                    self._served.add(record["_index"])
+                    self.replay_misses += 1
+                    return record
+        self.replay_misses += 1
+        return None
+
+    async def replay_think(self, role: str, model: str, prompt: str) -> str:
+        record = self._next_record("think", request_key(role, model, prompt))
+        if not record:
+            return f"[REPLAY] No recorded response left for {role}."
+        if self.time_scale > 0:
+            await asyncio.sleep(record["seconds"] * self.time_scale)
+        return record["response"]
+
+    async def replay_triage(self, user_request: str):
+        """Returns the recorded (depth, source) for a request, or None."""
+        # Another request's decision would be meaningless, so exact matches only
+        record = self._next_record("triage", request_key(user_request), fallback=False)
+        if not record:
+            return None
+        if self.time_scale > 0:
+            await asyncio.sleep(record["seconds"] * self.time_scale)
+        return record["depth"], record["source"]
+
+    def replay_tool(self, tool_name: str, args, kwargs):
+        record = self._next_record("tool", request_key(tool_name, list(args), kwargs))
+        if not record:
+            return f"[REPLAY] No recorded output left for tool '{tool_name}'."
+        if self.time_scale > 0:
+            # Tools run synchronously in production, so the replay blocks the same way
+            time.sleep(record["seconds"] * self.time_scale)
+        return record["result"]
+
+
+def capture_stats(path: str) -> dict:
+    """Summarizes a capture: call counts, payload sizes and timings per kind."""
+    stats = defaultdict(lambda: {"count": 0, "seconds_total": 0.0, "seconds_max": 0.0, "chars_total": 0})
+    for record in read_capture(path):
+        entry = stats[record["kind"]]
+        entry["count"] += 1
+        entry["seconds_total"] += record.get("seconds", 0)
+        entry["seconds_max"] = max(entry["seconds_max"], record.get("seconds", 0))
+        entry["chars_total"] += record.get("response_chars", record.get("result_chars", 0))
+
+    for entry in stats.values():
+        entry["seconds_avg"] = round(entry["seconds_total"] / entry["count"], 4)
+        entry["seconds_total"] = round(entry["seconds_total"], 3)
+    return dict(stats)
+
+
+async def replay_session(path: str, time_scale: float) -> dict:
+    """
+    Re-runs every recorded task through MotherBrain with all provider and
+    tool traffic served from the capture. Each task starts at its original
+    offset from the first one (scaled by time_scale), so requests that
+    overlapped in production overlap again.
+    """
+    # Swap the shared singleton so DualBrain and the tool registry see the replayer
+    from core import traffic_capture as capture_module
+    traffic = capture_module.traffic = TrafficCapture("replay", path, time_scale)
+
+    from mother_brain import MotherBrain
+    mother = MotherBrain()
+
+    tasks = traffic.recorded_tasks()
+    for task in tasks:
+        # Older captures only have the completion time
+        task.setdefault("started_at", task["ts"] - task["seconds"])
+    tasks.sort(key=lambda t: t["started_at"])
+    first = tasks[0]["started_at"] if tasks else 0
+
+    async def run(task):
+        await asyncio.sleep((task["started_at"] - first) * time_scale)
+        start = time.perf_counter()
+        await mother.process_task(task["message"], task["agent"])
+        elapsed = time.perf_counter() - start
+        print(f"[TrafficCapture] {task['agent']}: recorded {task['seconds']:.2f}s, replayed {elapsed:.2f}s")
+        return {"agent": task["agent"], "recorded_seconds": task["seconds"], "replayed_seconds": round(elapsed, 4)}
+
+    timings = await asyncio.gather(*(run(task) for task in tasks))
+
+    return {"tasks": len(timings), "replay_misses": traffic.replay_misses, "timings": timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay a traffic capture")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stats_cmd = sub.add_parser("stats", help="Summarize a capture file")
+    stats_cmd.add_argument("path")
+    replay_cmd = sub.add_parser("replay", help="Re-run the recorded session offline")
+    replay_cmd.add_argument("path")
+    replay_cmd.add_argument("--time-scale", type=float, default=1.0, help="Delay multiplier (0 = instant)")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(json.dumps(capture_stats(args.path), indent=2))
+    else:
+        report = asyncio.run(replay_session(args.path, args.time_scale))
+        print(json.dumps({k: v for k, v in report.items() if k != "timings"}, indent=2))
+
+
+# Singleton instance to be used across the app
+traffic = TrafficCapture.from_env()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from mother_brain import MotherBrain
 from core.status_broadcaster import broadcaster
+from core import traffic_capture
+from core.loop_monitor import loop_monitor
+from core.sampling_profiler import profiler
 import uvicorn
 import asyncio
+import hmac
+import os
 
 app = FastAPI()
 
@@ -21,6 +26,19 @@ app.add_middleware(
 # Initialize Mother Brain (Global Instance)
 mother = MotherBrain()
 
+@app.on_event("startup")
+async def start_loop_monitor():
+    loop_monitor.start()
+
+@app.on_event("shutdown")
+def stop_loop_monitor():
+    loop_monitor.stop()
+
+@app.on_event("shutdown")
+def close_traffic_capture():
+    # Finish the gzip member so the capture file ends cleanly
+    traffic_capture.traffic.close()
+
 # Data Models
 class UserRequest(BaseModel):
     message: str
@@ -52,5 +70,44 @@ async def chat_endpoint(request: UserRequest):
     response = await mother.process_task(request.message, request.agent_name, log_callback)
     return {"response": response}
 
+@app.get("/api/metrics/routing")
+def routing_metrics():
+    """
+    How Mother requests were routed (fast / reduced / full council) and their latency.
+    """
+    return mother.council.router.metrics.snapshot()
+
+def require_debug_token(token: str):
+    """
+    Debug endpoints only exist when DEBUG_TOKEN is set, and need it in X-Debug-Token.
+    """
+    expected = os.getenv("DEBUG_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(token or "", expected):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+@app.get("/api/debug/loop")
+def loop_stalls(x_debug_token: str = Header(None)):
+    """
+    Recent event-loop stalls with the stack that was blocking the loop.
+    """
+    require_debug_token(x_debug_token)
+    return loop_monitor.snapshot()
+
+@app.post("/api/debug/profile")
+async def profile_traffic(seconds: float = 10, x_debug_token: str = Header(None)):
+    """
+    Samples live traffic through MotherBrain.process_task for a few seconds.
+    """
+    require_debug_token(x_debug_token)
+    try:
+        # Sample from a worker thread so the event loop keeps serving the traffic we profile
+        return await asyncio.to_thread(profiler.run, seconds)
+    except RuntimeError:
+        # The profiler's own lock decides, so two concurrent requests cannot both start
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # permessage-deflate compresses both JSON and compact frames when the client supports it
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, ws_per_message_deflate=True)
@@ -1,11 +1,14 @@
 
 import os
+import time
 import asyncio
 from dotenv import load_dotenv
 
 # Import the new Hive Mind Core
 from core.high_council import HighCouncil
 from agents.agent_registry import get_agent_profile
+from core import traffic_capture
+from core.action_parser import ActionStreamParser, parse_action
 
 # Load environment variables
 load_dotenv("python_secrets.env")
@@ -14,16 +17,30 @@ class MotherBrain:
     def __init__(self):
         # Initialize the 5-Brain High Council
         self.council = HighCouncil()
+        # Sub-agents stream their first think and dispatch tools as soon as the action is parsed
+        self.stream_tool_dispatch = os.getenv("STREAM_TOOL_DISPATCH", "on").lower() not in ("0", "off", "false", "no")
         print("Mother Brain 2.0 (High Council) Initialized. Dual-Brain System Active.")
 
-    async def process_task(self, user_input: str, agent_name: str = "Mother", log_callback=None):
+    async def process_task(self, user_input: str, agent_name: str = "Mother", log_callback=None, raise_errors: bool = False):
         """
         The Thinking Process:
-        1. If Agent is 'Mother' -> Consult the High Council (5 steps).
+        1. If Agent is 'Mother' -> Triage, then consult the High Council (fast, reduced or full).
         2. If Agent is a Sub-Agent -> Retrieve Profile & Execute directly.
+
+        With raise_errors=True a failure is re-raised after it has been logged,
+        instead of being turned into the apology reply (used by the batch runner).
         """
+        # Record the incoming task so a captured session can be replayed end to end
+        if traffic_capture.traffic.recording:
+            started_at = time.time()
+            start = time.perf_counter()
+            response = await self._run_task(user_input, agent_name, log_callback, raise_errors)
+            traffic_capture.traffic.record_task(agent_name, user_input, started_at, time.perf_counter() - start)
+            return response
+        return await self._run_task(user_input, agent_name, log_callback, raise_errors)
+
+    async def _run_task(self, user_input: str, agent_name: str, log_callback=None, raise_errors: bool = False):
         from core.status_broadcaster import broadcaster
-        from core.tool_registry import execute_tool
 
         async def log(msg):
             if log_callback: 
@@ -37,8 +54,8 @@ class MotherBrain:
 
             # --- SCENARIO A: MOTHER (High Level Orchestration) ---
             if agent_name == "Mother":
-                # Mother uses the High Council to think deeply
-                response = await self.council.execute_council(user_input, log_callback)
+                # Mother triages first, then uses as much of the High Council as the request needs
+                response = await self.council.route_council(user_input, log_callback)
                 # finished
                 await broadcaster.broadcast_agent_status(agent_name, "IDLE")
                 return response
@@ -51,13 +68,45 @@ class MotherBrain:
                 # 2. Get Agent DNA
                 profile = get_agent_profile(agent_name)
                 role = profile.get("role", "Assistant")
-                base_prompt = profile.get("system_prompt", "You are a helpful assistant.")
                 tools = profile.get("tools", [])
 
                 await log(f"[{agent_name}] -> Role: {role} | Active Tools: {tools}")
 
-                # 3. Construct Tool-Aware Prompt
-                system_prompt = f"""
+                # 3. First Think with a Tool-Aware Prompt (Decide to use tool or not)
+                prompt = self.build_agent_prompt(agent_name, user_input)
+                if self.stream_tool_dispatch:
+                    response = await self.think_until_action(agent_name, prompt, log)
+                else:
+                    response = await self.council.brain.think(
+                        prompt=prompt, 
+                        role=agent_name, 
+                        preferred_model="openai" # Switch to OpenAI
+                    )
+                
+                # 4. Check for Action
+                response = await self.resolve_action(agent_name, user_input, response, log)
+
+                await log(f"[{agent_name}] -> Task Complete.")
+                await broadcaster.broadcast_agent_status(agent_name, "IDLE")
+                return response
+
+        except Exception as e:
+            error_msg = f"CRITICAL CORTEX FAILURE: {str(e)}"
+            await log(f"[{agent_name}] -> 🔴 {error_msg}")
+            await broadcaster.broadcast_agent_status(agent_name, "ERROR")
+            if raise_errors:
+                raise
+            return "I apologize. My neural link was severed. Please check the backend logs."
+
+    def build_agent_prompt(self, agent_name: str, user_input: str) -> str:
+        """
+        Builds the tool-aware prompt for a sub-agent's first think.
+        """
+        profile = get_agent_profile(agent_name)
+        base_prompt = profile.get("system_prompt", "You are a helpful assistant.")
+        tools = profile.get("tools", [])
+
+        system_prompt = f"""
                 {base_prompt}
                 
                 YOU HAVE ACCESS TO THESE TOOLS: {tools}
@@ -72,38 +121,44 @@ class MotherBrain:
                 ACTION: google_search
                 INPUT: tesla stock price
                 """
+        return f"{system_prompt}\n\nUSER TASK: {user_input}"
 
-                # 4. First Think (Decide to use tool or not)
-                response = await self.council.brain.think(
-                    prompt=f"{system_prompt}\n\nUSER TASK: {user_input}", 
-                    role=agent_name, 
-                    preferred_model="openai" # Switch to OpenAI
-                )
-                
-                # 5. Check for Action
-                if "ACTION:" in response and "INPUT:" in response:
-                    # Parse Action
-                    lines = response.split('\n')
-                    tool_name = next((l.split("ACTION:")[1].strip() for l in lines if "ACTION:" in l), None)
-                    tool_input = next((l.split("INPUT:")[1].strip() for l in lines if "INPUT:" in l), None)
-                    
-                    if tool_name and tool_input:
-                        await log(f"[{agent_name}] -> 🛠️ Executing Tool: {tool_name}...")
-                        
-                        # Execute Tool
-                        tool_result = execute_tool(tool_name, tool_input)
-                        await log(f"[{agent_name}] -> Tool Output: {tool_result}")
-                        
-                        # Final Synthesis
-                        final_prompt = f"Original Task: {user_input}\nTool Result: {tool_result}\n\nGive a final answer to the user."
-                        response = await self.council.brain.think(final_prompt, role=agent_name, preferred_model="openai")
+    async def resolve_action(self, agent_name: str, user_input: str, response: str, log):
+        """
+        If the agent's response asks for a tool, runs it and synthesizes the final answer.
+        Otherwise returns the response unchanged.
+        """
+        from core.tool_registry import execute_tool
 
-                await log(f"[{agent_name}] -> Task Complete.")
-                await broadcaster.broadcast_agent_status(agent_name, "IDLE")
-                return response
+        action = parse_action(response)
+        if action:
+            tool_name, tool_input = action
+            await log(f"[{agent_name}] -> 🛠️ Executing Tool: {tool_name}...")
+            
+            # Execute Tool
+            # Tools make blocking API calls (requests, Gmail .execute()); keep them off the loop
+            tool_result = await asyncio.to_thread(execute_tool, tool_name, tool_input)
+            await log(f"[{agent_name}] -> Tool Output: {tool_result}")
+            
+            # Final Synthesis
+            final_prompt = f"Original Task: {user_input}\nTool Result: {tool_result}\n\nGive a final answer to the user."
+            response = await self.council.brain.think(final_prompt, role=agent_name, preferred_model="openai")
 
-        except Exception as e:
-            error_msg = f"CRITICAL CORTEX FAILURE: {str(e)}"
-            await log(f"[{agent_name}] -> 🔴 {error_msg}")
-            await broadcaster.broadcast_agent_status(agent_name, "ERROR")
-            return "I apologize. My neural link was severed. Please check the backend logs."
+        return response
+
+    async def think_until_action(self, agent_name: str, prompt: str, log):
+        """
+        Streams the agent's first think and stops the generation as soon as a complete
+        ACTION/INPUT block has arrived; whatever follows it is filler we never use.
+        OpenAI generations are cancelled at that point, Gemini ones are only ignored.
+        """
+        parser = ActionStreamParser()
+        stream = self.council.brain.think_stream(prompt, role=agent_name, preferred_model="openai")
+        try:
+            async for chunk in stream:
+                if parser.feed(chunk):
+                    await log(f"[{agent_name}] -> ⚡ Tool decision parsed mid-stream, skipping the rest")
+                    break
+        finally:
+            await stream.aclose()
+        return parser.text